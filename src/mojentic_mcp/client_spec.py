@@ -7,11 +7,13 @@ from mojentic_mcp.client import McpClient, McpClientError, McpToolExecutionError
 from mojentic_mcp.transports import McpTransport, McpTransportError, HttpTransport # Import a concrete one for some tests
 from mojentic_mcp.rpc import JsonRpcRequest, JsonRpcError, JsonRpcErrorCode
 
+_TRANSPORT_SPEC = dir(McpTransport)
+
 
 @pytest.fixture
 def mock_transport_base(mocker):
     """Creates a base mock McpTransport."""
-    transport = Mock(spec=McpTransport)
+    transport = Mock(spec=_TRANSPORT_SPEC)
     transport.initialize = Mock()
     transport.shutdown = Mock()
     # Default send_request to avoid NotImplementError if not overridden by specific test
@@ -50,7 +52,7 @@ def mock_transport1(mock_transport_base, mocker):
 @pytest.fixture
 def mock_transport2(mock_transport_base, mocker): # Uses a new instance of mock_transport_base
     # Need a distinct mock object for transport2
-    transport2 = Mock(spec=McpTransport)
+    transport2 = Mock(spec=_TRANSPORT_SPEC)
     transport2.initialize = Mock()
     transport2.shutdown = Mock()
 
@@ -187,7 +189,7 @@ class DescribeMcpClient:
         mock_transport1.shutdown.assert_called_once() # From __exit__
         
     def should_handle_transport_errors_gracefully_during_tool_discovery(self, mock_transport1, mocker):
-        failing_transport = Mock(spec=McpTransport)
+        failing_transport = Mock(spec=_TRANSPORT_SPEC)
         failing_transport.initialize = Mock()
         failing_transport.send_request.side_effect = McpTransportError("Discovery failed on this one")
         failing_transport.shutdown = Mock()
@@ -224,13 +226,13 @@ class DescribeToolAccessor:
         result_a = client_for_accessor.tools.tool_a(param_x="hello")
         assert result_a == "Dynamic call successful!"
         client_for_accessor.call_tool.assert_called_once_with("tool_a", param_x="hello")
-        client_for_accessor.call_tool.reset_mock()
+        client_for_accessor.call_tool = Mock(return_value="Dynamic call successful!")
 
         # Call tool_b
         result_b = client_for_accessor.tools.tool_b(param_y=123)
         assert result_b == "Dynamic call successful!"
         client_for_accessor.call_tool.assert_called_once_with("tool_b", param_y=123)
-        client_for_accessor.call_tool.reset_mock()
+        client_for_accessor.call_tool = Mock(return_value="Dynamic call successful!")
 
         # Call shared_tool (should be routed to transport1's version)
         result_shared = client_for_accessor.tools.shared_tool()
@@ -248,10 +250,12 @@ class DescribeToolAccessor:
         assert dynamic_tool_a_method.__doc__ == "Tool A from T1"
 
         # Test with a tool that might not have a description in its schema (though unlikely for good tools)
-        mock_transport1.send_request.side_effect = lambda req: {
-            "jsonrpc": "2.0", "id": req.id, 
+        # Only tools/list is sent, so a fixed response will do
+        mock_transport1.send_request.side_effect = None
+        mock_transport1.send_request.return_value = {
+            "jsonrpc": "2.0", "id": "mcp_client_tools_list_1",
             "result": {"tools": [{"name": "no_desc_tool", "inputSchema": {}}]} # No description field
-        } if req.method == "tools/list" else None # Simplified for this test
+        }
         
         client_no_desc = McpClient(transports=[mock_transport1])
         dynamic_no_desc_method = client_no_desc.tools.no_desc_tool
@@ -1,45 +1,87 @@
-import json
-from typing import Any, Dict, List, Optional
+import importlib.util
+import os
+import selectors
+from typing import Any, List, Optional
 
 import httpx
 import structlog
 import sys
 import subprocess
 
+from mojentic_mcp.json_codec import loads as _loads
+
 logger = structlog.get_logger()
 
+_READ_CHUNK_SIZE = 65536
+
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+# MCP sessions make many small calls to one server, so keep idle connections around longer than httpx's 5s default
+DEFAULT_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
 
 class HttpClientGateway:
     """A thin gateway for HTTP operations using httpx."""
     
-    def __init__(self, timeout: float = 30.0):
+    def __init__(self, timeout: float = 30.0, http2: bool = True, limits: httpx.Limits = DEFAULT_HTTP_LIMITS):
         """Initialize the HTTP gateway.
         
         Args:
             timeout (float, optional): The timeout for HTTP requests in seconds. Defaults to 30.0.
+            http2 (bool, optional): Whether to negotiate HTTP/2 so concurrent requests share one
+                connection. Servers that only speak HTTP/1.1 are still supported. Requires the
+                `h2` package; without it the client uses HTTP/1.1. Defaults to True.
+            limits (httpx.Limits, optional): Connection pool limits for the client. Defaults to
+                DEFAULT_HTTP_LIMITS.
         """
         self._timeout = timeout
+        self._http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._limits = limits
         self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
     
     def initialize(self) -> None:
-        """Initialize the HTTP client."""
-        self._client = httpx.Client(timeout=self._timeout)
+        """Initialize the HTTP client.
+
+        One client, and so one keep-alive connection pool, is used for every request until shutdown.
+        """
+        self._client = httpx.Client(**self._client_options())
+
+    def _client_options(self) -> dict:
+        return {
+            "timeout": self._timeout,
+            "http2": self._http2,
+            "limits": self._limits,
+        }
     
     def shutdown(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client and let go of the asynchronous client.
+
+        The asynchronous client can only be closed from its event loop, so use ashutdown to close it
+        as well. It is released here either way, so the next apost opens a fresh one.
+        """
+        self._async_client = None
         if self._client:
             self._client.close()
             self._client = None
+
+    async def ashutdown(self) -> None:
+        """Close the asynchronous HTTP client, if one was opened, and then the HTTP client."""
+        if self._async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.shutdown()
     
-    def post(self, url: str, json_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Send a POST request with JSON data.
+    def post(self, url: str, content: bytes) -> Any:
+        """Send a POST request with an already serialized JSON body.
         
         Args:
             url (str): The URL to send the request to.
-            json_data (Dict[str, Any]): The JSON data to send.
+            content (bytes): The JSON body to send, an array for batches.
             
         Returns:
-            Dict[str, Any]: The JSON response.
+            Any: The JSON response, a list for batches, or None when the server sends no body,
+                as it does for a batch made only of notifications.
             
         Raises:
             httpx.HTTPStatusError: If the HTTP request returns a 4xx or 5xx status code.
@@ -49,17 +91,58 @@ class HttpClientGateway:
         if not self._client:
             raise RuntimeError("HTTP client not initialized. Call initialize() first.")
         
-        response = self._client.post(url, json=json_data)
+        response = self._client.post(url, content=content, headers=_JSON_CONTENT_TYPE)
+        response.raise_for_status()
+        return _loads(response.content) if response.content else None
+
+    async def apost(self, url: str, content: bytes) -> Any:
+        """Send a POST request with an already serialized JSON body without blocking the event loop.
+
+        An asynchronous client with the same settings as the HTTP client is opened on first use and
+        kept until shutdown, so concurrent posts share its connections. It is bound to the event loop
+        it was first used from.
+
+        Args:
+            url (str): The URL to send the request to.
+            content (bytes): The JSON body to send.
+
+        Returns:
+            Any: The JSON response.
+
+        Raises:
+            httpx.HTTPStatusError: If the HTTP request returns a 4xx or 5xx status code.
+            httpx.RequestError: If the HTTP request fails.
+            json.JSONDecodeError: If the response is not valid JSON.
+        """
+        if not self._client:
+            raise RuntimeError("HTTP client not initialized. Call initialize() first.")
+
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(**self._client_options())
+
+        response = await self._async_client.post(url, content=content, headers=_JSON_CONTENT_TYPE)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
 
 
 class StdioGateway:
     """A thin gateway for STDIO operations using subprocess."""
     
-    def __init__(self):
-        """Initialize the STDIO gateway."""
+    def __init__(self, timeout: Optional[float] = None):
+        """Initialize the STDIO gateway.
+
+        Args:
+            timeout (float, optional): The time in seconds to wait for output from the process
+                before giving up. Defaults to None, which waits indefinitely. Pipes cannot be
+                polled on Windows, so the timeout is ignored there.
+        """
+        self._timeout = timeout
         self._process: Optional[subprocess.Popen] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._stdin_fd: Optional[int] = None
+        self._stdout_fd: Optional[int] = None
+        self._read_buffer = bytearray()
+        self._last_raw_bytes: Optional[bytes] = None
     
     def start_process(self, command: List[str]) -> int:
         """Start a subprocess with STDIO pipes.
@@ -74,15 +157,18 @@ class StdioGateway:
             FileNotFoundError: If the command is not found.
             subprocess.SubprocessError: If the subprocess fails to start.
         """
+        # Unbuffered binary pipes: lines are written and read on the raw file descriptors, without
+        # Python-level buffering, locking or text decoding in between
         self._process = subprocess.Popen(
             command,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            bufsize=0
         )
+        self._stdin_fd = self._process.stdin.fileno()
+        self._stdout_fd = self._process.stdout.fileno()
+        self._read_buffer = bytearray()
         return self._process.pid
     
     def is_process_running(self) -> bool:
@@ -95,11 +181,11 @@ class StdioGateway:
             return False
         return self._process.poll() is None
     
-    def write_line(self, line: str) -> None:
+    def write_line(self, line: bytes) -> None:
         """Write a line to the process's stdin.
         
         Args:
-            line (str): The line to write.
+            line (bytes): The serialized line to write, without its trailing newline.
             
         Raises:
             BrokenPipeError: If the pipe is broken.
@@ -108,31 +194,95 @@ class StdioGateway:
         if not self._process or not self._process.stdin or self._process.stdin.closed:
             raise ValueError("Process not running or stdin not available.")
         
-        self._process.stdin.write(line + "\n")
-        self._process.stdin.flush()
+        self._write_all(line + b"\n")
+    
+    def _write_all(self, data: bytes) -> None:
+        """Write data to the stdin file descriptor, continuing after partial writes to a full pipe."""
+        view = memoryview(data)
+        while view:
+            written = os.write(self._stdin_fd, view)
+            view = view[written:]
     
-    def read_line(self) -> str:
+    def read_line(self) -> bytes:
         """Read a line from the process's stdout.
-        
+
+        Output is read straight from the pipe's file descriptor in chunks of up to 64KB into a
+        private buffer, so that waiting for it can be bounded by the gateway's timeout.
+
         Returns:
-            str: The line read.
+            bytes: The line read, without surrounding whitespace.
             
         Raises:
             ValueError: If the process is not running.
+            EOFError: If the process closed its stdout.
+            TimeoutError: If no complete line arrives within the timeout.
         """
         if not self._process or not self._process.stdout or self._process.stdout.closed:
             raise ValueError("Process not running or stdout not available.")
-        
-        line = self._process.stdout.readline()
-        if not line:
-            raise EOFError("No more output from process.")
-        
-        return line.strip()
+
+        # Only scan bytes that have not been searched yet, so a large response arriving over
+        # many chunks is scanned once rather than once per chunk.
+        search_from = 0
+        while True:
+            newline_index = self._read_buffer.find(b"\n", search_from)
+            if newline_index >= 0:
+                line = bytes(self._read_buffer[:newline_index])
+                del self._read_buffer[:newline_index + 1]
+                return line.strip()
+            search_from = len(self._read_buffer)
+
+            self._wait_for_output()
+            chunk = os.read(self._stdout_fd, _READ_CHUNK_SIZE)
+            if not chunk:
+                if self._read_buffer:
+                    line = bytes(self._read_buffer)
+                    self._read_buffer.clear()
+                    return line.strip()
+                raise EOFError("No more output from process.")
+            self._read_buffer += chunk
+
+    def read_response(self) -> Any:
+        """Read a line from the process's stdout and decode it as JSON.
+
+        The raw line is kept in last_raw_bytes so that callers can report it when decoding fails.
+
+        Returns:
+            Any: The decoded JSON value, a dict for a single response or a list for a batch.
+
+        Raises:
+            ValueError: If the process is not running.
+            EOFError: If the process closed its stdout.
+            TimeoutError: If no complete line arrives within the timeout.
+            json.JSONDecodeError: If the line is not valid JSON.
+        """
+        self._last_raw_bytes = self.read_line()
+        return _loads(self._last_raw_bytes)
+
+    @property
+    def last_raw_bytes(self) -> Optional[bytes]:
+        """The most recent raw line read by read_response."""
+        return self._last_raw_bytes
+
+    def _wait_for_output(self) -> None:
+        """Block until stdout is readable, or raise TimeoutError once the timeout expires."""
+        if self._timeout is None or sys.platform == "win32":
+            return
+
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._process.stdout, selectors.EVENT_READ)
+
+        if not self._selector.select(timeout=self._timeout):
+            raise TimeoutError(f"No output from process within {self._timeout} seconds.")
     
     def terminate_process(self) -> None:
         """Terminate the process."""
         if not self._process:
             return
+
+        if self._selector:
+            self._selector.close()
+            self._selector = None
         
         # Close stdin if it's open
         if self._process.stdin and not self._process.stdin.closed:
@@ -174,6 +324,6 @@ class StdioGateway:
             return ""
         
         try:
-            return self._process.stderr.read()
+            return self._process.stderr.read().decode("utf-8", errors="replace")
         except Exception:
             return ""
\ No newline at end of file
@@ -0,0 +1,343 @@
+import asyncio
+import json
+import os
+import subprocess
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, call, patch
+
+import httpx
+import pytest
+
+from mojentic_mcp.gateways import DEFAULT_HTTP_LIMITS, HttpClientGateway, StdioGateway
+
+_HTTPX_CLIENT_SPEC = dir(httpx.Client)
+
+# Payloads larger than one read chunk and than a pipe's buffer, built once at import
+_LARGE_RESPONSE_LINE = b'{"result": "' + b"x" * 100_000 + b'"}'
+_LARGE_REQUEST_LINE = b'{"params": "' + b"x" * 200_000 + b'"}'
+
+# Expected constructor calls, compared against call_args_list so each also checks for a single call
+_EXPECTED_POPEN_CALL = call(["my_server"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+_EXPECTED_HTTP2_CLIENT_CALL = call(timeout=10.0, http2=True, limits=DEFAULT_HTTP_LIMITS)
+_EXPECTED_HTTP1_CLIENT_CALL = call(timeout=30.0, http2=False, limits=DEFAULT_HTTP_LIMITS)
+
+
+@pytest.fixture(scope="class")
+def patched_httpx_client():
+    # Patched once for the class that uses it; the class resets the mocks before each test
+    client_class = Mock(return_value=Mock(spec=_HTTPX_CLIENT_SPEC))
+    with patch("httpx.Client", new=client_class):
+        yield client_class
+
+
+@pytest.fixture(scope="module")
+def popen_mocks():
+    # Only attribute access and plain calls are needed, so skip MagicMock's magic-method machinery
+    return SimpleNamespace(
+        stdin=Mock(closed=False),
+        stdout=Mock(closed=False),
+        stderr=Mock(closed=False),
+        poll=Mock(),
+        terminate=Mock(),
+        wait=Mock(),
+        kill=Mock()
+    )
+
+
+class DescribeHttpClientGateway:
+    """Tests for the HttpClientGateway class."""
+
+    @pytest.fixture(autouse=True)
+    def mock_httpx_client(self, patched_httpx_client):
+        # The class mock keeps returning the same client, so reset the client's configuration separately
+        patched_httpx_client.reset_mock(side_effect=True)
+        mock_client = patched_httpx_client.return_value
+        mock_client.reset_mock(return_value=True, side_effect=True)
+        mock_client.post.return_value.content = b'{"jsonrpc": "2.0", "id": 1, "result": "success"}'
+        return patched_httpx_client
+
+    def should_initialize_httpx_client_with_http2(self, mock_httpx_client):
+        gateway = HttpClientGateway(timeout=10.0)
+
+        gateway.initialize()
+
+        assert mock_httpx_client.call_args_list == [_EXPECTED_HTTP2_CLIENT_CALL]
+
+    def should_fall_back_to_http1_when_disabled(self, mock_httpx_client):
+        gateway = HttpClientGateway(http2=False)
+
+        gateway.initialize()
+
+        assert mock_httpx_client.call_args_list == [_EXPECTED_HTTP1_CLIENT_CALL]
+
+    def should_initialize_and_shutdown_httpx_client(self, mock_httpx_client):
+        gateway = HttpClientGateway()
+
+        gateway.initialize()
+        gateway.shutdown()
+
+        mock_httpx_client.return_value.close.assert_called_once()
+        assert gateway._client is None
+
+    def should_post_json_and_return_response(self, mock_httpx_client):
+        gateway = HttpClientGateway()
+        gateway.initialize()
+
+        response = gateway.post("http://example.com/mcp", b'{"jsonrpc":"2.0","id":1,"method":"test"}')
+
+        assert response == {"jsonrpc": "2.0", "id": 1, "result": "success"}
+        mock_httpx_client.return_value.post.assert_called_once_with(
+            "http://example.com/mcp",
+            content=b'{"jsonrpc":"2.0","id":1,"method":"test"}',
+            headers={"Content-Type": "application/json"}
+        )
+
+    def should_return_none_for_empty_response_body(self, mock_httpx_client):
+        mock_httpx_client.return_value.post.return_value.content = b""
+        gateway = HttpClientGateway()
+        gateway.initialize()
+
+        assert gateway.post("http://example.com/mcp", b'[{"jsonrpc":"2.0","method":"notifications/initialized"}]') is None
+
+    def should_raise_json_decode_error_for_invalid_response_body(self, mock_httpx_client):
+        mock_httpx_client.return_value.post.return_value.content = b"<html>Bad Gateway</html>"
+        gateway = HttpClientGateway()
+        gateway.initialize()
+
+        with pytest.raises(json.JSONDecodeError):
+            gateway.post("http://example.com/mcp", b'{"id":1}')
+
+    def should_reuse_one_client_across_posts(self, mock_httpx_client):
+        gateway = HttpClientGateway()
+        gateway.initialize()
+
+        gateway.post("http://example.com/mcp", b'{"id":1}')
+        gateway.post("http://example.com/mcp", b'{"id":2}')
+
+        mock_httpx_client.assert_called_once()
+        assert mock_httpx_client.return_value.post.call_count == 2
+
+    def should_pass_custom_pool_limits(self, mock_httpx_client):
+        limits = httpx.Limits(max_connections=4, max_keepalive_connections=2, keepalive_expiry=60.0)
+        gateway = HttpClientGateway(limits=limits)
+
+        gateway.initialize()
+
+        assert mock_httpx_client.call_args.kwargs["limits"] is limits
+
+    def should_post_asynchronously_with_a_client_opened_on_first_use(self, mocker, mock_httpx_client):
+        mock_async_client_class = mocker.patch("httpx.AsyncClient", new=Mock())
+        mock_async_client = mock_async_client_class.return_value
+        mock_async_client.post = AsyncMock(return_value=Mock(content=b'{"jsonrpc": "2.0", "id": 1, "result": "ok"}'))
+        mock_async_client.aclose = AsyncMock()
+        gateway = HttpClientGateway()
+        gateway.initialize()
+
+        async def exercise():
+            first = await gateway.apost("http://example.com/mcp", b'{"id":1}')
+            second = await gateway.apost("http://example.com/mcp", b'{"id":2}')
+            await gateway.ashutdown()
+            return first, second
+
+        first, second = asyncio.run(exercise())
+
+        assert first == second == {"jsonrpc": "2.0", "id": 1, "result": "ok"}
+        mock_async_client_class.assert_called_once_with(**mock_httpx_client.call_args.kwargs)
+        mock_async_client.aclose.assert_awaited_once()
+        mock_httpx_client.return_value.close.assert_called_once()
+
+    def should_open_a_fresh_async_client_after_shutdown(self, mocker, mock_httpx_client):
+        mock_async_client_class = mocker.patch("httpx.AsyncClient", new=Mock())
+        mock_async_client_class.return_value.post = AsyncMock(return_value=Mock(content=b'{"result": "ok"}'))
+        gateway = HttpClientGateway()
+
+        for _ in range(2):
+            gateway.initialize()
+            asyncio.run(gateway.apost("http://example.com/mcp", b'{"id":1}'))
+            gateway.shutdown()
+
+        assert mock_async_client_class.call_count == 2
+
+    def should_raise_runtime_error_if_not_initialized(self):
+        gateway = HttpClientGateway()
+
+        with pytest.raises(RuntimeError, match="HTTP client not initialized"):
+            gateway.post("http://example.com/mcp", b"{}")
+
+
+class DescribeHttpClientGatewayClient:
+    """Tests for the httpx client the HttpClientGateway opens, left unpatched."""
+
+    def should_ask_for_compressed_responses(self):
+        gateway = HttpClientGateway()
+        gateway.initialize()
+
+        try:
+            assert "gzip" in gateway._client.headers["Accept-Encoding"]
+        finally:
+            gateway.shutdown()
+
+
+class DescribeStdioGateway:
+    """Tests for the StdioGateway class."""
+
+    @pytest.fixture
+    def mock_popen_instance(self, popen_mocks):
+        # Reuse the module's mocks, cleared of the previous test's calls and configuration. Tests may swap
+        # in real pipes on the returned namespace without touching the shared mocks.
+        for mock in vars(popen_mocks).values():
+            mock.reset_mock(return_value=True, side_effect=True)
+        popen_mocks.poll.return_value = None
+        return SimpleNamespace(pid=12345, **vars(popen_mocks))
+
+    @pytest.fixture(autouse=True)
+    def mock_popen_class(self, mocker, mock_popen_instance):
+        # mocker.patch would stand a MagicMock in for the class; a plain Mock is all the specs need
+        return mocker.patch("subprocess.Popen", new=Mock(return_value=mock_popen_instance))
+
+    def should_start_process_with_stdio_pipes(self, mock_popen_class):
+        gateway = StdioGateway()
+
+        pid = gateway.start_process(["my_server"])
+
+        assert pid == 12345
+        assert mock_popen_class.call_args_list == [_EXPECTED_POPEN_CALL]
+
+    def should_write_line_with_trailing_newline(self, mock_popen_instance):
+        read_fd, write_fd = os.pipe()
+        mock_popen_instance.stdin = os.fdopen(write_fd, "wb", buffering=0)
+        gateway = StdioGateway()
+        gateway.start_process(["my_server"])
+
+        try:
+            gateway.write_line(b'{"id": 1}')
+
+            assert os.read(read_fd, 1024) == b'{"id": 1}\n'
+        finally:
+            mock_popen_instance.stdin.close()
+            os.close(read_fd)
+
+    def should_write_line_larger_than_pipe_buffer(self, mock_popen_instance):
+        read_fd, write_fd = os.pipe()
+        mock_popen_instance.stdin = os.fdopen(write_fd, "wb", buffering=0)
+        line = _LARGE_REQUEST_LINE
+        received = bytearray()
+
+        def drain():
+            while not received.endswith(b"\n"):
+                received.extend(os.read(read_fd, 65536))
+
+        reader = threading.Thread(target=drain)
+        gateway = StdioGateway()
+        gateway.start_process(["my_server"])
+
+        try:
+            reader.start()
+            gateway.write_line(line)
+            reader.join(timeout=1.0)
+
+            assert bytes(received) == line + b"\n"
+        finally:
+            mock_popen_instance.stdin.close()
+            os.close(read_fd)
+
+    def should_decode_stderr_output(self, mock_popen_instance):
+        mock_popen_instance.stderr.read.return_value = b"Traceback\n"
+        gateway = StdioGateway()
+        gateway.start_process(["my_server"])
+
+        assert gateway.get_stderr_output() == "Traceback\n"
+
+    def should_read_lines_from_process_stdout(self, mock_popen_instance):
+        read_fd, write_fd = os.pipe()
+        mock_popen_instance.stdout = os.fdopen(read_fd, "rb")
+        os.write(write_fd, b'{"id": 1}\n{"id": 2}\n')
+        gateway = StdioGateway(timeout=1.0)
+        gateway.start_process(["my_server"])
+
+        try:
+            assert gateway.read_line() == b'{"id": 1}'
+            assert gateway.read_line() == b'{"id": 2}'
+        finally:
+            mock_popen_instance.stdout.close()
+            os.close(write_fd)
+
+    def should_read_large_line_arriving_in_several_chunks(self, mock_popen_instance):
+        read_fd, write_fd = os.pipe()
+        mock_popen_instance.stdout = os.fdopen(read_fd, "rb")
+        line = _LARGE_RESPONSE_LINE
+        writer = threading.Thread(
+            target=lambda: (os.write(write_fd, line[:50_000]), os.write(write_fd, line[50_000:] + b"\n")))
+        gateway = StdioGateway(timeout=1.0)
+        gateway.start_process(["my_server"])
+
+        try:
+            writer.start()
+            assert gateway.read_line() == line
+        finally:
+            writer.join(timeout=1.0)
+            mock_popen_instance.stdout.close()
+            os.close(write_fd)
+
+    def should_decode_json_response_and_keep_raw_bytes(self, mock_popen_instance):
+        read_fd, write_fd = os.pipe()
+        mock_popen_instance.stdout = os.fdopen(read_fd, "rb")
+        os.write(write_fd, b'{"jsonrpc": "2.0", "id": 1, "result": "ok"}\n')
+        gateway = StdioGateway(timeout=1.0)
+        gateway.start_process(["my_server"])
+
+        try:
+            assert gateway.read_response() == {"jsonrpc": "2.0", "id": 1, "result": "ok"}
+            assert gateway.last_raw_bytes == b'{"jsonrpc": "2.0", "id": 1, "result": "ok"}'
+        finally:
+            mock_popen_instance.stdout.close()
+            os.close(write_fd)
+
+    def should_raise_eof_error_when_stdout_closes(self, mock_popen_instance):
+        read_fd, write_fd = os.pipe()
+        mock_popen_instance.stdout = os.fdopen(read_fd, "rb")
+        os.close(write_fd)
+        gateway = StdioGateway(timeout=1.0)
+        gateway.start_process(["my_server"])
+
+        try:
+            with pytest.raises(EOFError):
+                gateway.read_line()
+        finally:
+            mock_popen_instance.stdout.close()
+
+    def should_raise_timeout_error_when_no_output_arrives(self, mocker, mock_popen_instance):
+        # Report an expired wait straight away instead of sleeping through the timeout
+        mock_selector = mocker.patch("selectors.DefaultSelector", new=Mock()).return_value
+        mock_selector.select.return_value = []
+        gateway = StdioGateway(timeout=5.0)
+        gateway.start_process(["my_server"])
+
+        with pytest.raises(TimeoutError, match="within 5.0 seconds"):
+            gateway.read_line()
+
+        mock_selector.select.assert_called_once_with(timeout=5.0)
+
+    def should_terminate_process_and_close_pipes(self, mock_popen_instance):
+        gateway = StdioGateway()
+        gateway.start_process(["my_server"])
+
+        gateway.terminate_process()
+
+        mock_popen_instance.stdin.close.assert_called_once()
+        mock_popen_instance.terminate.assert_called_once()
+        mock_popen_instance.wait.assert_called_once_with(timeout=5)
+        mock_popen_instance.stdout.close.assert_called_once()
+        mock_popen_instance.stderr.close.assert_called_once()
+        assert not gateway.is_process_running()
+
+    def should_kill_process_that_does_not_exit_after_terminate(self, mock_popen_instance):
+        # The stubbed wait raises at once, so the 5 second grace period never elapses
+        mock_popen_instance.wait.side_effect = subprocess.TimeoutExpired(cmd="my_server", timeout=5)
+        gateway = StdioGateway()
+        gateway.start_process(["my_server"])
+
+        gateway.terminate_process()
+
+        mock_popen_instance.kill.assert_called_once()
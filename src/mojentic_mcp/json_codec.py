@@ -0,0 +1,34 @@
+"""JSON encoding and decoding for Mojentic MCP messages.
+
+orjson is used when it is installed, with the standard library json module as the fallback.
+Both write compact UTF-8 and hand values they cannot encode themselves to pydantic, so the
+bytes on the wire do not depend on which one is in use.
+"""
+
+import functools
+import json
+from typing import Any
+
+from pydantic_core import to_jsonable_python
+
+
+def _jsonable(obj: Any) -> Any:
+    # Hand anything the JSON encoder cannot write (nested models, datetimes, ...) to pydantic,
+    # so params serialize the same way model_dump_json would serialize them
+    return to_jsonable_python(obj, exclude_none=True)
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes with the standard library json module."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_jsonable).encode("utf-8")
+
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    dumps = functools.partial(orjson.dumps, default=_jsonable, option=_ORJSON_OPTIONS)
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    dumps = stdlib_dumps
+    loads = json.loads
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+import pytest
+
+from mojentic_mcp.json_codec import dumps, loads, stdlib_dumps
+
+
+class DescribeJsonCodec:
+    """Tests for the JSON encoding and decoding helpers."""
+
+    @pytest.mark.parametrize("payload", [
+        {"jsonrpc": "2.0", "id": 1, "method": "test", "params": {"counts": {1: "one"}}},
+        {"jsonrpc": "2.0", "id": 1, "method": "test", "params": {"when": datetime(2024, 1, 2, 3, 4, 5)}},
+        {"jsonrpc": "2.0", "id": 1, "method": "test", "params": {"text": "é"}},
+    ])
+    def should_serialize_same_bytes_without_orjson(self, payload):
+        assert stdlib_dumps(payload) == dumps(payload)
+
+    def should_decode_bytes(self):
+        assert loads(b'{"jsonrpc":"2.0","id":1,"result":"ok"}') == {"jsonrpc": "2.0", "id": 1, "result": "ok"}
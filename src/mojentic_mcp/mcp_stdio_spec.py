@@ -6,6 +6,16 @@ from mojentic_mcp.mcp_stdio import StdioMcpServer
 from mojentic_mcp.rpc import JsonRpcHandler
 
 
+# Request lines as a client writes them, serialized ahead of time rather than in each test
+_INITIALIZE_LINE = (
+    '{"jsonrpc": "2.0", "id": 1, "method": "initialize", '
+    '"params": {"protocolVersion": "2025-03-26", "capabilities": {}}}\n'
+)
+_TOOLS_LIST_LINE = '{"jsonrpc": "2.0", "id": 8, "method": "tools/list", "params": {}}\n'
+_TOOLS_CALL_LINE = '{"jsonrpc": "2.0", "id": 9, "method": "tools/call", "params": {"name": "examine", "arguments": {}}}\n'
+_LEGACY_EXAMINE_LINE = '{"command": "examine", "directory": ".", "format": "markdown"}\n'
+
+
 class DescribeStdioMcpServer:
 
     def setup_method(self, method):
@@ -16,16 +26,6 @@ class DescribeStdioMcpServer:
         self.mock_stdin = StringIO()
 
     def should_handle_initialize_request(self):
-        initialize_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2025-03-26",
-                "capabilities": {}
-            }
-        }
-
         mock_response = {
             "jsonrpc": "2.0",
             "id": 1,
@@ -42,8 +42,8 @@ class DescribeStdioMcpServer:
         }
         self.mock_rpc_handler.handle_request.return_value = mock_response
 
-        # Convert request to JSON and add to mock stdin
-        self.mock_stdin.write(json.dumps(initialize_request) + "\n")
+        # Add the request line to mock stdin
+        self.mock_stdin.write(_INITIALIZE_LINE)
         self.mock_stdin.seek(0)  # Reset position to beginning
 
         # Patch stdin and stdout
@@ -67,14 +67,6 @@ class DescribeStdioMcpServer:
         assert response_json["result"]["serverInfo"]["version"] == "0.1.0"
 
     def should_handle_tools_list_request(self):
-        # Prepare the tools/list request
-        tools_list_request = {
-            "jsonrpc": "2.0",
-            "id": 8,
-            "method": "tools/list",
-            "params": {}
-        }
-
         # Mock the RPC handler response
         mock_response = {
             "jsonrpc": "2.0",
@@ -90,8 +82,8 @@ class DescribeStdioMcpServer:
         }
         self.mock_rpc_handler.handle_request.return_value = mock_response
 
-        # Convert request to JSON and add to mock stdin
-        self.mock_stdin.write(json.dumps(tools_list_request) + "\n")
+        # Add the request line to mock stdin
+        self.mock_stdin.write(_TOOLS_LIST_LINE)
         self.mock_stdin.seek(0)  # Reset position to beginning
 
         # Patch stdin and stdout
@@ -119,17 +111,6 @@ class DescribeStdioMcpServer:
         assert "description" in examine_tool
 
     def should_handle_tools_call_examine_request(self):
-        # Prepare the tools/call request
-        tools_call_request = {
-            "jsonrpc": "2.0",
-            "id": 9,
-            "method": "tools/call",
-            "params": {
-                "name": "examine",
-                "arguments": {}
-            }
-        }
-
         # Mock the RPC handler response
         mock_response = {
             "jsonrpc": "2.0",
@@ -142,8 +123,8 @@ class DescribeStdioMcpServer:
         }
         self.mock_rpc_handler.handle_request.return_value = mock_response
 
-        # Convert request to JSON and add to mock stdin
-        self.mock_stdin.write(json.dumps(tools_call_request) + "\n")
+        # Add the request line to mock stdin
+        self.mock_stdin.write(_TOOLS_CALL_LINE)
         self.mock_stdin.seek(0)  # Reset position to beginning
 
         # Patch stdin and stdout
@@ -170,13 +151,6 @@ class DescribeStdioMcpServer:
         assert "modules_found" in response_json["result"]
 
     def should_handle_legacy_examine_request(self):
-        # Prepare the legacy examine request
-        legacy_request = {
-            "command": "examine",
-            "directory": ".",
-            "format": "markdown"
-        }
-
         # Mock the RPC handler response
         mock_result = {
             "status": "success",
@@ -190,8 +164,8 @@ class DescribeStdioMcpServer:
         }
         self.mock_rpc_handler.handle_request.return_value = mock_response
 
-        # Convert request to JSON and add to mock stdin
-        self.mock_stdin.write(json.dumps(legacy_request) + "\n")
+        # Add the request line to mock stdin
+        self.mock_stdin.write(_LEGACY_EXAMINE_LINE)
         self.mock_stdin.seek(0)  # Reset position to beginning
 
         # Patch stdin and stdout
@@ -12,6 +12,8 @@ import structlog
 from mojentic.llm.tools.llm_tool import LLMTool
 from pydantic import BaseModel, Field
 
+from mojentic_mcp.json_codec import dumps as _dumps
+
 logger = structlog.get_logger()
 
 
@@ -31,6 +33,27 @@ class JsonRpcRequest(BaseModel):
     method: str = Field(..., description="Method name")
     params: Optional[Dict[str, Any]] = Field(None, description="Method parameters")
 
+    def to_payload_bytes(self, include_jsonrpc: bool = True) -> bytes:
+        """Serialize the request to compact JSON for the wire, omitting unset fields.
+
+        The four fields are written out by hand rather than walked generically, which makes this
+        the cheapest way to put a request on the wire.
+
+        Args:
+            include_jsonrpc (bool, optional): Whether to include the "jsonrpc" version member.
+                Only leave it out for servers known to accept requests without it. Defaults to True.
+
+        Returns:
+            bytes: The serialized request.
+        """
+        payload = {"jsonrpc": self.jsonrpc} if include_jsonrpc else {}
+        if self.id is not None:
+            payload["id"] = self.id
+        payload["method"] = self.method
+        if self.params is not None:
+            payload["params"] = self.params
+        return _dumps(payload)
+
 
 class JsonRpcError(Exception):
     """Exception raised for JSON-RPC errors."""
@@ -1,6 +1,11 @@
 """Tests for the JSON-RPC handler."""
 
+import json
+from datetime import datetime
+from typing import Optional
+
 import pytest
+from pydantic import BaseModel
 from unittest.mock import Mock
 
 from mojentic_mcp.rpc import JsonRpcHandler, JsonRpcRequest, JsonRpcErrorCode
@@ -41,6 +46,45 @@ def mock_tool():
     return mock_tool
 
 
+class DescribeJsonRpcRequest:
+    """Tests for the JsonRpcRequest model."""
+
+    def should_serialize_to_compact_payload_bytes(self):
+        request = JsonRpcRequest(id=1, method="tools/call", params={"name": "examine"})
+
+        assert request.to_payload_bytes() == b'{"jsonrpc":"2.0","id":1,"method":"tools/call","params":{"name":"examine"}}'
+
+    def should_omit_unset_id_and_params_from_payload_bytes(self):
+        request = JsonRpcRequest(method="notifications/initialized")
+
+        assert request.to_payload_bytes() == b'{"jsonrpc":"2.0","method":"notifications/initialized"}'
+
+    def should_leave_out_jsonrpc_member_on_request(self):
+        request = JsonRpcRequest(id=1, method="ping")
+
+        assert request.to_payload_bytes(include_jsonrpc=False) == b'{"id":1,"method":"ping"}'
+
+    def should_match_pydantic_serialization(self):
+        request = JsonRpcRequest(id="abc", method="test", params={"nested": {"values": [1, 2.5, None, "é"]}})
+
+        assert json.loads(request.to_payload_bytes()) == json.loads(request.model_dump_json(exclude_none=True))
+
+    def should_serialize_params_with_integer_keys(self):
+        request = JsonRpcRequest(id=1, method="test", params={"counts": {1: "one", 2: "two"}})
+
+        assert json.loads(request.to_payload_bytes()) == json.loads(request.model_dump_json(exclude_none=True))
+
+    def should_serialize_params_holding_pydantic_models(self):
+        class Point(BaseModel):
+            x: int
+            y: int
+            label: Optional[str] = None
+
+        request = JsonRpcRequest(id=1, method="test", params={"point": Point(x=1, y=2), "when": datetime(2024, 1, 2, 3, 4, 5)})
+
+        assert json.loads(request.to_payload_bytes()) == json.loads(request.model_dump_json(exclude_none=True))
+
+
 class DescribeJsonRpcHandler:
     """Tests for the JsonRpcHandler class."""
 
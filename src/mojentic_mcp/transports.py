@@ -1,15 +1,33 @@
 import abc
+import asyncio
+import functools
+import itertools
 import json
+import re
 import threading
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import structlog
 
 from mojentic_mcp.rpc import JsonRpcRequest, JsonRpcError, JsonRpcErrorCode
 from mojentic_mcp.gateways import HttpClientGateway, StdioGateway
+from mojentic_mcp.json_codec import loads as _loads
 
 logger = structlog.get_logger()
 
+_REQUEST_PREFIX = b'{"jsonrpc":"2.0","id":'
+
+# Integer or unescaped string "id" members, found in a raw message without decoding it
+_ID_RE = re.compile(rb'"id"\s*:\s*(?:(-?\d+)|"([^"\\]*)")')
+
+
+def _candidate_ids(line: bytes):
+    """Yield every value an "id" member takes in a raw JSON message, nested ones included."""
+    for match in _ID_RE.finditer(line):
+        number, string = match.groups()
+        yield int(number) if number is not None else string.decode()
+
 
 class McpTransport(abc.ABC):
     """Abstract base class for MCP transports."""
@@ -30,6 +48,24 @@ class McpTransport(abc.ABC):
         """
         pass
 
+    async def asend_request(self, rpc_request: JsonRpcRequest) -> Dict[str, Any]:
+        """Sends a JSON-RPC request from a coroutine and returns the response.
+
+        Transports that cannot overlap requests run send_request in a worker thread, so the event
+        loop is not blocked while waiting for the response.
+
+        Args:
+            rpc_request: The JSON-RPC request object.
+
+        Returns:
+            The JSON-RPC response as a dictionary.
+
+        Raises:
+            McpTransportError: If a transport-level error occurs.
+            JsonRpcError: If the server returns a JSON-RPC error.
+        """
+        return await asyncio.to_thread(self.send_request, rpc_request)
+
     def initialize(self) -> None:
         """Initializes the transport (e.g., connect, start subprocess)."""
         pass
@@ -38,6 +74,10 @@ class McpTransport(abc.ABC):
         """Shuts down the transport (e.g., disconnect, stop subprocess)."""
         pass
 
+    async def ashutdown(self) -> None:
+        """Shuts down the transport from a coroutine, releasing any asynchronous resources."""
+        self.shutdown()
+
     def __enter__(self):
         self.initialize()
         return self
@@ -45,16 +85,64 @@ class McpTransport(abc.ABC):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.shutdown()
 
+    async def __aenter__(self):
+        self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.ashutdown()
+
 
 class McpTransportError(Exception):
     """Base exception for transport-related errors."""
     pass
 
 
+def _raise_for_error(response_json: Dict[str, Any]) -> None:
+    """Raise the JSON-RPC error carried by a response, if any, with a single key lookup."""
+    error = response_json.get("error")
+    if error is not None:
+        raise JsonRpcError(code=error.get("code"), message=error.get("message"), data=error.get("data"))
+
+
+def _correlate_batch(rpc_requests: List[JsonRpcRequest], response_json: Any) -> List[Optional[Dict[str, Any]]]:
+    """Match the responses of a JSON-RPC batch back to the requests that produced them.
+
+    Args:
+        rpc_requests: The requests that were sent in the batch.
+        response_json: The decoded batch response.
+
+    Returns:
+        The responses in the same order as the requests, with None for notifications (requests without an ID).
+
+    Raises:
+        JsonRpcError: If the server rejected the batch as a whole.
+        McpTransportError: If the response is not a batch or is missing a response for a request.
+    """
+    if response_json is None and all(rpc_request.id is None for rpc_request in rpc_requests):
+        # Servers send nothing back for a batch made only of notifications
+        return [None] * len(rpc_requests)
+    if isinstance(response_json, dict):
+        _raise_for_error(response_json)
+    if not isinstance(response_json, list):
+        raise McpTransportError(f"Expected a JSON-RPC batch response but received: {type(response_json).__name__}")
+
+    responses_by_id = {response.get("id"): response for response in response_json if isinstance(response, dict)}
+    responses: List[Optional[Dict[str, Any]]] = []
+    for rpc_request in rpc_requests:
+        if rpc_request.id is None:
+            responses.append(None)
+        elif rpc_request.id in responses_by_id:
+            responses.append(responses_by_id[rpc_request.id])
+        else:
+            raise McpTransportError(f"No response for request ID {rpc_request.id} in batch response")
+    return responses
+
+
 class HttpTransport(McpTransport):
     """MCP Transport using HTTP."""
 
-    def __init__(self, url: str = None, host: str = None, port: int = None, path: str = "/jsonrpc", timeout: float = 30.0, http_gateway: Optional[HttpClientGateway] = None):
+    def __init__(self, url: str = None, host: str = None, port: int = None, path: str = "/jsonrpc", timeout: float = 30.0, http_gateway: Optional[HttpClientGateway] = None, strict_jsonrpc: bool = True):
         """Initialize the HTTP transport.
 
         Args:
@@ -64,6 +152,8 @@ class HttpTransport(McpTransport):
             path (str, optional): The path to the JSON-RPC endpoint. Defaults to "/jsonrpc".
             timeout (float, optional): The timeout for HTTP requests in seconds. Defaults to 30.0.
             http_gateway (HttpGateway, optional): The HTTP gateway to use. If not provided, a new one will be created.
+            strict_jsonrpc (bool, optional): Whether to send the "jsonrpc": "2.0" member with every request. Set to
+                False only for servers that accept requests without it, to shrink each payload. Defaults to True.
 
         Raises:
             ValueError: If neither url nor both host and port are provided.
@@ -76,6 +166,7 @@ class HttpTransport(McpTransport):
             raise ValueError("Either url or both host and port must be provided")
 
         self._timeout = timeout
+        self._strict_jsonrpc = strict_jsonrpc
         self._http_gateway = http_gateway or HttpClientGateway(timeout=timeout)
 
     def initialize(self) -> None:
@@ -87,43 +178,137 @@ class HttpTransport(McpTransport):
         logger.info("HttpTransport shutdown", url=self._url)
 
     def send_request(self, rpc_request: JsonRpcRequest) -> Dict[str, Any]:
-        request_payload = rpc_request.model_dump(exclude_none=True)
-        logger.debug("Sending HTTP request", url=self._url, payload=request_payload)
         try:
-            response_json = self._http_gateway.post(self._url, request_payload)
-            logger.debug("Received HTTP response", response=response_json)
+            return self._checked_response(self._http_gateway.post(self._url, self._request_payload(rpc_request)))
+        except Exception as e:
+            raise self._transport_error(e) from e
+
+    async def asend_request(self, rpc_request: JsonRpcRequest) -> Dict[str, Any]:
+        """Sends a JSON-RPC request without blocking the event loop.
+
+        Concurrent calls, for example from asyncio.gather, are multiplexed over a single
+        connection when the server supports HTTP/2.
+
+        Args:
+            rpc_request: The JSON-RPC request object.
+
+        Returns:
+            The JSON-RPC response as a dictionary.
+
+        Raises:
+            McpTransportError: If a transport-level error occurs.
+            JsonRpcError: If the server returns a JSON-RPC error.
+        """
+        try:
+            return self._checked_response(await self._http_gateway.apost(self._url, self._request_payload(rpc_request)))
+        except Exception as e:
+            raise self._transport_error(e) from e
+
+    def _request_payload(self, rpc_request: JsonRpcRequest) -> bytes:
+        logger.debug("Sending HTTP request", url=self._url, payload=rpc_request)
+        return rpc_request.to_payload_bytes(self._strict_jsonrpc)
 
-            if "error" in response_json:
-                err = response_json["error"]
-                raise JsonRpcError(code=err.get("code"), message=err.get("message"), data=err.get("data"))
-            return response_json
-        except RuntimeError as e:
+    def _checked_response(self, response_json: Dict[str, Any]) -> Dict[str, Any]:
+        logger.debug("Received HTTP response", response=response_json)
+        _raise_for_error(response_json)
+        return response_json
+
+    def _transport_error(self, e: Exception) -> McpTransportError:
+        if isinstance(e, RuntimeError):
             logger.error("HTTP gateway error", exc_info=True)
-            raise McpTransportError(f"HTTP client not initialized: {e}") from e
+            return McpTransportError(f"HTTP client not initialized: {e}")
+        logger.error("HTTP request error", exc_info=True)
+        return McpTransportError(f"HTTP request failed: {e}")
+
+    async def ashutdown(self) -> None:
+        await self._http_gateway.ashutdown()
+        logger.info("HttpTransport shutdown", url=self._url)
+
+    def send_batch(self, rpc_requests: List[JsonRpcRequest]) -> List[Optional[Dict[str, Any]]]:
+        """Sends several JSON-RPC requests as a single batch in one POST.
+
+        The server must support JSON-RPC batches. Responses that carry an error are returned
+        as-is rather than raised, so one failing call does not discard the others.
+
+        Args:
+            rpc_requests: The JSON-RPC request objects.
+
+        Returns:
+            The JSON-RPC responses in the same order as the requests, with None for notifications.
+
+        Raises:
+            McpTransportError: If a transport-level error occurs or the batch response is malformed.
+        """
+        if not rpc_requests:
+            return []
+
+        payloads = (rpc_request.to_payload_bytes(self._strict_jsonrpc) for rpc_request in rpc_requests)
+        request_payload = b"[" + b",".join(payloads) + b"]"
+        logger.debug("Sending HTTP batch request", url=self._url, payload=rpc_requests)
+        try:
+            response_json = self._http_gateway.post(self._url, request_payload)
+            logger.debug("Received HTTP batch response", response=response_json)
+            return _correlate_batch(rpc_requests, response_json)
         except Exception as e:
-            logger.error("HTTP request error", exc_info=True)
-            raise McpTransportError(f"HTTP request failed: {e}") from e
+            raise self._transport_error(e) from e
+
+    def send_many(self, rpc_requests: List[JsonRpcRequest], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sends several JSON-RPC requests concurrently.
+
+        Each request is posted from its own worker thread. When the server supports HTTP/2 the
+        requests are multiplexed over a single connection; HTTP/1.1 servers are served from the
+        connection pool instead.
+
+        Args:
+            rpc_requests: The JSON-RPC request objects.
+            max_workers: The maximum number of requests in flight at once. Defaults to the
+                ThreadPoolExecutor default.
+
+        Returns:
+            The JSON-RPC responses, in the same order as the requests.
+
+        Raises:
+            McpTransportError: If a transport-level error occurs for any request.
+        """
+        if not rpc_requests:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.send_request, rpc_requests))
 
 
 class StdioTransport(McpTransport):
     """MCP Transport using STDIO with a subprocess."""
 
-    def __init__(self, command: List[str], stdio_gateway: Optional[StdioGateway] = None):
+    def __init__(self, command: List[str], stdio_gateway: Optional[StdioGateway] = None, timeout: float = 30.0,
+                 on_notification: Optional[Callable[[Any], None]] = None):
         """Initialize the STDIO transport.
 
         Args:
             command (List[str]): The command to run.
             stdio_gateway (StdioGateway, optional): The STDIO gateway to use. If not provided, a new one will be created.
+            timeout (float, optional): The time in seconds to wait for a response from the process. Defaults to 30.0.
+            on_notification (Callable, optional): Called with each decoded message the process sends that
+                is not a response to a request, such as a server notification or a request from the server.
+                Without it those messages are discarded.
         """
         self._command = command
-        self._stdio_gateway = stdio_gateway or StdioGateway()
-        self._request_id_counter = 1  # Simple counter for stdio requests if not provided
-        self._lock = threading.Lock()  # To ensure one request/response cycle at a time
+        self._timeout = timeout
+        self._stdio_gateway = stdio_gateway or StdioGateway(timeout=timeout)
+        self._on_notification = on_notification
+        self._request_ids = itertools.count(1)  # IDs for stdio requests that do not provide one
+        self._write_lock = threading.Lock()  # Serializes request ID assignment and writes to stdin
+        self._read_lock = threading.Lock()  # Serializes reads from stdout, handed over from the write lock
         self._pid = None
+        self._alive = False  # Cleared when the pipe breaks or closes, so requests need not poll the process
+        self._request_suffixes: Dict[Tuple[str, bool], bytes] = {}  # Serialized tails of parameterless requests, by method
+        self._pending: Dict[Any, asyncio.Future] = {}  # Futures of in-flight asend_request calls, by request ID
+        self._reader_task: Optional[asyncio.Task] = None
 
     def initialize(self) -> None:
         try:
             self._pid = self._stdio_gateway.start_process(self._command)
+            self._alive = True
             logger.info("StdioTransport initialized", command=self._command, pid=self._pid)
         except FileNotFoundError:
             logger.error("Stdio command not found", command=self._command)
@@ -139,9 +324,8 @@ class StdioTransport(McpTransport):
                 # Send exit request before terminating
                 if self._stdio_gateway.is_process_running():
                     try:
-                        exit_request = JsonRpcRequest(jsonrpc="2.0", id=self._request_id_counter, method="exit", params={})
-                        self._request_id_counter += 1
-                        self._stdio_gateway.write_line(json.dumps(exit_request.model_dump(exclude_none=True)))
+                        exit_request = JsonRpcRequest(jsonrpc="2.0", id=next(self._request_ids), method="exit", params={})
+                        self._stdio_gateway.write_line(exit_request.to_payload_bytes())
                     except Exception:
                         logger.warn("Failed to send exit command for stdio process", pid=self._pid, exc_info=True)
 
@@ -151,53 +335,277 @@ class StdioTransport(McpTransport):
                 logger.warn("Error during StdioTransport shutdown", pid=self._pid, exc_info=True)
 
             self._pid = None
+        self._alive = False
         logger.info("StdioTransport shutdown complete")
 
     def send_request(self, rpc_request: JsonRpcRequest) -> Dict[str, Any]:
-        if not self._pid or not self._stdio_gateway.is_process_running():
+        return self._exchange([rpc_request], batch=False, read=lambda: self._read_response(rpc_request))
+
+    async def asend_request(self, rpc_request: JsonRpcRequest) -> Dict[str, Any]:
+        """Sends a JSON-RPC request without waiting for the responses to earlier ones.
+
+        The request is written straight away and its response is awaited on a future keyed by the
+        request ID. A single reader task reads responses from the process and resolves the future
+        with the matching ID, so many requests can be in flight on the one pipe at once. Requests
+        without an ID are assigned one, as in send_request.
+
+        Do not call send_request or send_batch while asynchronous requests are in flight, as they
+        would read responses meant for the reader task.
+
+        Args:
+            rpc_request: The JSON-RPC request object.
+
+        Returns:
+            The JSON-RPC response as a dictionary.
+
+        Raises:
+            McpTransportError: If a transport-level error occurs.
+            JsonRpcError: If the server returns a JSON-RPC error.
+        """
+        if not self._alive:
             raise McpTransportError("STDIO process not running or process terminated.")
 
-        with self._lock:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._write_lock:
             if rpc_request.id is None:
-                rpc_request.id = self._request_id_counter
-                self._request_id_counter += 1
+                rpc_request.id = next(self._request_ids)
+            if rpc_request.id in self._pending:
+                raise McpTransportError(f"A request with ID {rpc_request.id} is already in flight")
+
+            logger.debug("Sending STDIO request", payload=rpc_request, pid=self._pid)
+
+            self._pending[rpc_request.id] = future
+            future.add_done_callback(functools.partial(self._forget_if_cancelled, rpc_request.id))
+            try:
+                self._stdio_gateway.write_line(self._serialize_request(rpc_request))
+            except Exception as e:
+                del self._pending[rpc_request.id]
+                raise self._transport_error(e) from e
+
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = loop.create_task(self._read_pending_responses())
+        return await future
+
+    async def _read_pending_responses(self) -> None:
+        """Read responses while asynchronous requests are in flight, resolving each request's future by ID.
+
+        The IDs in each raw line are checked against the pending requests first, so only lines that
+        can answer one of them, or that a notification handler wants, are decoded.
+        """
+        while self._pending:
+            try:
+                line = await asyncio.to_thread(self._read_line_in_turn)
+            except Exception as e:
+                self._fail_pending(self._transport_error(e))
+                return
+
+            if self._may_answer_pending(line):
+                self._resolve_pending(line)
+            else:
+                self._dispatch_notification(line)
+
+    def _resolve_pending(self, line: bytes) -> None:
+        """Decode a response line and settle the future of the request it answers."""
+        try:
+            response_json = _loads(line)
+        except json.JSONDecodeError:
+            # The line cannot be matched to a request, but the next one still can
+            logger.error("Failed to decode JSON response from STDIO", pid=self._pid, exc_info=True, response_line=line)
+            return
+
+        future = self._pending.pop(response_json.get("id"), None) if isinstance(response_json, dict) else None
+        if future is None:
+            self._dispatch_notification(line, response_json)
+            return
+        if future.cancelled():
+            return
+
+        logger.debug("Received STDIO response", response=response_json, pid=self._pid)
+        try:
+            _raise_for_error(response_json)
+        except JsonRpcError as e:
+            future.set_exception(e)
+        else:
+            future.set_result(response_json)
+
+    def _may_answer_pending(self, line: bytes) -> bool:
+        candidates = list(_candidate_ids(line))
+        if any(candidate in self._pending for candidate in candidates):
+            return True
+        # An ID the pattern cannot read, such as a string with escapes, takes a full decode to match
+        return line.count(b'"id"') > len(candidates)
+
+    def _dispatch_notification(self, line: bytes, message: Any = None) -> None:
+        if self._on_notification is None:
+            logger.debug("Discarding STDIO message for no pending request", pid=self._pid)
+            return
+
+        try:
+            self._on_notification(_loads(line) if message is None else message)
+        except Exception:
+            logger.error("Failed to handle STDIO notification", pid=self._pid, exc_info=True, response_line=line)
+
+    def _forget_if_cancelled(self, request_id: Any, future: asyncio.Future) -> None:
+        # A cancelled caller will never collect its response, so stop waiting for it
+        if future.cancelled() and self._pending.get(request_id) is future:
+            del self._pending[request_id]
+
+    def _read_line_in_turn(self) -> bytes:
+        with self._read_lock:
+            try:
+                return self._stdio_gateway.read_line()
+            except EOFError:
+                raise self._stdout_closed_error()
+
+    def _fail_pending(self, error: McpTransportError) -> None:
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def send_batch(self, rpc_requests: List[JsonRpcRequest]) -> List[Dict[str, Any]]:
+        """Sends several JSON-RPC requests as a single batch on one line.
+
+        The server must support JSON-RPC batches. Requests without an ID are assigned one, as in
+        send_request. Responses that carry an error are returned as-is rather than raised, so one
+        failing call does not discard the others.
+
+        Args:
+            rpc_requests: The JSON-RPC request objects.
+
+        Returns:
+            The JSON-RPC responses, in the same order as the requests.
+
+        Raises:
+            McpTransportError: If a transport-level error occurs or the batch response is malformed.
+        """
+        if not rpc_requests:
+            return []
+        return self._exchange(rpc_requests, batch=True, read=lambda: self._read_batch_response(rpc_requests))
 
-            request_payload_str = json.dumps(rpc_request.model_dump(exclude_none=True))
-            logger.debug("Sending STDIO request", payload=request_payload_str, pid=self._pid)
+    def _exchange(self, rpc_requests: List[JsonRpcRequest], batch: bool, read: Callable[[], Any]) -> Any:
+        if not self._alive:
+            raise McpTransportError("STDIO process not running or process terminated.")
+
+        with self._write_lock:
+            for rpc_request in rpc_requests:
+                if rpc_request.id is None:
+                    rpc_request.id = next(self._request_ids)
+
+            logger.debug("Sending STDIO request", payload=rpc_requests if batch else rpc_requests[0], pid=self._pid)
 
             try:
-                self._stdio_gateway.write_line(request_payload_str)
-
-                try:
-                    response_line = self._stdio_gateway.read_line()
-                except EOFError:
-                    stderr_output = self._stdio_gateway.get_stderr_output()
-                    logger.error("No response from STDIO process", pid=self._pid, stderr=stderr_output)
-                    raise McpTransportError(f"No response from STDIO process (PID: {self._pid}) or process terminated.")
-
-                logger.debug("Received STDIO response line", line=response_line, pid=self._pid)
-                response_json = json.loads(response_line)
-
-                if "error" in response_json:
-                    err = response_json["error"]
-                    raise JsonRpcError(code=err.get("code"), message=err.get("message"), data=err.get("data"))
-
-                if rpc_request.id is not None and response_json.get("id") != rpc_request.id:
-                    logger.warn("Received STDIO response with mismatched ID",
-                                expected_id=rpc_request.id, actual_id=response_json.get("id"), pid=self._pid)
-
-                return response_json
-
-            except ValueError as e:
-                logger.error("STDIO process error", pid=self._pid, exc_info=True)
-                raise McpTransportError(f"STDIO process error: {e}") from e
-            except BrokenPipeError:
-                logger.error("Broken pipe with STDIO process. Process likely terminated.", pid=self._pid, exc_info=True)
-                stderr_content = self._stdio_gateway.get_stderr_output()
-                raise McpTransportError(f"Broken pipe with STDIO process (PID: {self._pid}). Stderr: {stderr_content[:500]}") # Limit stderr length
-            except json.JSONDecodeError as e:
-                logger.error("Failed to decode JSON response from STDIO", pid=self._pid, exc_info=True, response_line=response_line)
-                raise McpTransportError(f"Invalid JSON response from STDIO server: {e}") from e
+                if batch:
+                    line = b"[" + b",".join(self._serialize_request(rpc_request) for rpc_request in rpc_requests) + b"]"
+                else:
+                    line = self._serialize_request(rpc_requests[0])
+                self._stdio_gateway.write_line(line)
             except Exception as e:
-                logger.error("Error during STDIO communication", pid=self._pid, exc_info=True)
-                raise McpTransportError(f"STDIO communication error: {e}") from e
+                raise self._transport_error(e) from e
+
+            # Take the read lock before giving up the write lock so that responses are
+            # read back in the same order the requests were written.
+            self._read_lock.acquire()
+
+        try:
+            # An earlier reader may have timed out or lost the process while this request waited its
+            # turn; its late reply would then be read here as this request's response.
+            if not self._alive:
+                raise McpTransportError("STDIO process not running or process terminated.")
+            return read()
+        except Exception as e:
+            raise self._transport_error(e) from e
+        finally:
+            self._read_lock.release()
+
+    def _serialize_request(self, rpc_request: JsonRpcRequest) -> bytes:
+        """Serialize a request for the wire, splicing the ID into a cached template when possible.
+
+        Requests without parameters (pings, listings) only differ by ID, so everything after the
+        ID is serialized once per method and reused.
+        """
+        if rpc_request.params or rpc_request.jsonrpc != "2.0" or type(rpc_request.id) is not int:
+            return rpc_request.to_payload_bytes()
+
+        key = (rpc_request.method, rpc_request.params is None)
+        suffix = self._request_suffixes.get(key)
+        if suffix is None:
+            template = rpc_request.model_copy(update={"id": 0}).to_payload_bytes()
+            suffix = template[len(_REQUEST_PREFIX) + 1:]
+            self._request_suffixes[key] = suffix
+        return _REQUEST_PREFIX + str(rpc_request.id).encode() + suffix
+
+    def _read_response(self, rpc_request: JsonRpcRequest) -> Dict[str, Any]:
+        response_json = self._read_message()
+        if not isinstance(response_json, dict):
+            raise self._out_of_step_error(f"Expected a JSON-RPC response but received: {type(response_json).__name__}")
+
+        # Servers answer requests they could not parse with a null ID, so only a different ID is a mismatch
+        response_id = response_json.get("id")
+        if response_id is not None and response_id != rpc_request.id:
+            raise self._out_of_step_error(f"STDIO response ID {response_id} does not match request ID {rpc_request.id}")
+
+        _raise_for_error(response_json)
+        return response_json
+
+    def _read_batch_response(self, rpc_requests: List[JsonRpcRequest]) -> List[Dict[str, Any]]:
+        response_json = self._read_message()
+        try:
+            return _correlate_batch(rpc_requests, response_json)
+        except McpTransportError as e:
+            raise self._out_of_step_error(str(e)) from e
+
+    def _read_message(self) -> Any:
+        """Read the next message that can answer a request, handing server notifications and requests to on_notification."""
+        while True:
+            message = self._read_json()
+            if not (isinstance(message, dict) and "method" in message):
+                return message
+            self._dispatch_notification(self._stdio_gateway.last_raw_bytes, message)
+
+    def _read_json(self) -> Any:
+        try:
+            response_json = self._stdio_gateway.read_response()
+        except EOFError:
+            raise self._stdout_closed_error()
+
+        logger.debug("Received STDIO response", response=response_json, pid=self._pid)
+        return response_json
+
+    def _out_of_step_error(self, message: str) -> McpTransportError:
+        # Responses are no longer lined up with requests, so stop using the process
+        self._alive = False
+        logger.error("Received STDIO message that does not answer the request", pid=self._pid, reason=message)
+        return McpTransportError(message)
+
+    def _stdout_closed_error(self) -> McpTransportError:
+        self._alive = False
+        stderr_output = self._stdio_gateway.get_stderr_output()
+        logger.error("No response from STDIO process", pid=self._pid, stderr=stderr_output)
+        return McpTransportError(f"No response from STDIO process (PID: {self._pid}) or process terminated.")
+
+    def _transport_error(self, e: Exception) -> McpTransportError:
+        if isinstance(e, McpTransportError):
+            return e
+        if isinstance(e, TimeoutError):
+            # A late response would be read as the answer to the next request, so stop using the process
+            self._alive = False
+            logger.error("Timed out waiting for STDIO response", pid=self._pid, timeout=self._timeout)
+            return McpTransportError(
+                f"STDIO read timeout: no response from process (PID: {self._pid}) within {self._timeout} seconds")
+        if isinstance(e, json.JSONDecodeError):
+            logger.error("Failed to decode JSON response from STDIO", pid=self._pid, exc_info=True,
+                         response_line=self._stdio_gateway.last_raw_bytes)
+            return McpTransportError(f"Invalid JSON response from STDIO server: {e}")
+        if isinstance(e, ValueError):
+            self._alive = False
+            logger.error("STDIO process error", pid=self._pid, exc_info=True)
+            return McpTransportError(f"STDIO process error: {e}")
+        if isinstance(e, BrokenPipeError):
+            self._alive = False
+            logger.error("Broken pipe with STDIO process. Process likely terminated.", pid=self._pid, exc_info=True)
+            stderr_content = self._stdio_gateway.get_stderr_output()
+            return McpTransportError(f"Broken pipe with STDIO process (PID: {self._pid}). Stderr: {stderr_content[:500]}") # Limit stderr length
+        logger.error("Error during STDIO communication", pid=self._pid, exc_info=True)
+        return McpTransportError(f"STDIO communication error: {e}")
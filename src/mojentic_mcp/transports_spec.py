@@ -1,19 +1,128 @@
+import asyncio
 import json
-from unittest.mock import Mock, patch, MagicMock, ANY
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, call
 
+import httpx
 import pytest
 
 from mojentic_mcp.rpc import JsonRpcRequest, JsonRpcError
 from mojentic_mcp.transports import HttpTransport, StdioTransport, McpTransportError
 from mojentic_mcp.gateways import HttpClientGateway, StdioGateway
 
+_HTTP_GATEWAY_SPEC = dir(HttpClientGateway)
+_STDIO_GATEWAY_SPEC = dir(StdioGateway)
+
+# Requests validated once at import and shared; transports only assign IDs to requests that arrive without one
+_TEST_REQUEST = JsonRpcRequest(id=1, method="test")
+_TEST_PARAMS_REQUEST = JsonRpcRequest(id=1, method="test", params={"key": "value"})
+_UNKNOWN_REQUEST = JsonRpcRequest(id=1, method="unknown")
+
+# Expected wire payloads, written out once rather than re-serialized in every test
+_EXPECTED_TEST = b'{"jsonrpc":"2.0","id":1,"method":"test"}'
+_EXPECTED_TEST_PARAMS = b'{"jsonrpc":"2.0","id":1,"method":"test","params":{"key":"value"}}'
+_EXPECTED_TEST_PARAMS_LAX = b'{"id":1,"method":"test","params":{"key":"value"}}'
+_EXPECTED_TEST1 = b'{"jsonrpc":"2.0","id":1,"method":"test1"}'
+_EXPECTED_TEST2 = b'{"jsonrpc":"2.0","id":2,"method":"test2"}'
+_EXPECTED_PING7 = b'{"jsonrpc":"2.0","id":7,"method":"ping","params":{}}'
+_EXPECTED_PING8 = b'{"jsonrpc":"2.0","id":8,"method":"ping","params":{}}'
+_EXIT_MSG = b'{"jsonrpc":"2.0","id":1,"method":"exit","params":{}}'
+_EXPECTED_AUTO_ID_WRITES = [call(_EXPECTED_TEST1), call(_EXPECTED_TEST2)]
+_EXPECTED_BATCH = (
+    b'[{"jsonrpc":"2.0","id":1,"method":"test1"},{"jsonrpc":"2.0","id":2,"method":"test2"},'
+    b'{"jsonrpc":"2.0","id":3,"method":"test3"},{"jsonrpc":"2.0","id":4,"method":"test4"}]'
+)
+
+# A 404 as the gateway raises it. The error is only read, never mutated, so one instance serves every spec;
+# HTTPStatusError never looks at its request, so a bare sentinel stands in for one.
+_SENTINEL_REQUEST = object()
+_HTTP_404 = SimpleNamespace(status_code=404, text="Not Found")
+_HTTP_404_ERR = httpx.HTTPStatusError("404 Not Found", request=_SENTINEL_REQUEST, response=_HTTP_404)
+
+# Messages a server may write to stdout between responses
+_LOG_NOTIFICATION = {"jsonrpc": "2.0", "method": "notifications/message", "params": {"level": "info", "data": "working"}}
+_ROOTS_REQUEST = {"jsonrpc": "2.0", "id": 99, "method": "roots/list"}
+
+# Raw response lines for the pipelined requests, by request ID
+_RESPONSE_LINES = {i: b'{"jsonrpc":"2.0","id":%d,"result":"result%d"}' % (i, i) for i in range(1, 11)}
+
+
+def _http_case():
+    gateway = Mock(spec=_HTTP_GATEWAY_SPEC)
+
+    def sent():
+        assert all(c.args[0] == "http://example.com/mcp" for c in gateway.post.call_args_list)
+        return [c.args[1] for c in gateway.post.call_args_list]
+
+    transport = HttpTransport(url="http://example.com/mcp", http_gateway=gateway)
+    return SimpleNamespace(transport=transport, reply=gateway.post, sent=sent)
+
+
+def _stdio_case():
+    gateway = Mock(spec=_STDIO_GATEWAY_SPEC)
+    gateway.start_process.return_value = 12345
+
+    def sent():
+        return [c.args[0] for c in gateway.write_line.call_args_list]
+
+    transport = StdioTransport(command=["my_server"], stdio_gateway=gateway)
+    return SimpleNamespace(transport=transport, reply=gateway.read_response, sent=sent)
+
+
+class DescribeTransportBehavior:
+    """Tests for the behaviour every transport shares, run against each one over a mock gateway."""
+
+    @pytest.fixture(params=[_http_case, _stdio_case], ids=["http", "stdio"])
+    def case(self, request):
+        case = request.param()
+        with case.transport:
+            yield case
+
+    def should_send_request_and_receive_response(self, case):
+        case.reply.return_value = {"jsonrpc": "2.0", "id": 1, "result": "success"}
+
+        response = case.transport.send_request(_TEST_PARAMS_REQUEST)
+
+        assert response == {"jsonrpc": "2.0", "id": 1, "result": "success"}
+        assert case.sent() == [_EXPECTED_TEST_PARAMS]
+
+    def should_raise_json_rpc_error_if_server_returns_rpc_error(self, case):
+        case.reply.return_value = {"jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Method not found"}}
+
+        # The transports wrap JsonRpcError in McpTransportError
+        with pytest.raises(McpTransportError, match="Method not found"):
+            case.transport.send_request(_UNKNOWN_REQUEST)
+
+    def should_return_response_with_null_error_field(self, case):
+        case.reply.return_value = {"jsonrpc": "2.0", "id": 1, "result": "success", "error": None}
+
+        response = case.transport.send_request(_TEST_REQUEST)
+
+        assert response["result"] == "success"
+
+    def should_send_batch_and_match_responses_by_id(self, case):
+        # Responses arrive out of order and are matched back to requests by ID
+        case.reply.return_value = [{"jsonrpc": "2.0", "id": i, "result": f"result{i}"} for i in (3, 1, 4, 2)]
+
+        responses = case.transport.send_batch([JsonRpcRequest(id=i, method=f"test{i}") for i in range(1, 5)])
+
+        assert [r["result"] for r in responses] == ["result1", "result2", "result3", "result4"]
+        assert case.sent() == [_EXPECTED_BATCH]
+
+    def should_raise_mcp_transport_error_if_batch_response_is_missing_an_id(self, case):
+        case.reply.return_value = [{"jsonrpc": "2.0", "id": 1, "result": "result1"}]
+
+        with pytest.raises(McpTransportError, match="No response for request ID 2"):
+            case.transport.send_batch([JsonRpcRequest(id=1, method="test1"), JsonRpcRequest(id=2, method="test2")])
+
 
 class DescribeHttpTransport:
     """Tests for the HttpTransport class."""
 
     @pytest.fixture
     def mock_http_gateway(self, mocker):
-        mock_gateway = Mock(spec=HttpClientGateway)
+        mock_gateway = Mock(spec=_HTTP_GATEWAY_SPEC)
         mock_gateway.post.return_value = {"jsonrpc": "2.0", "id": 1, "result": "success"}
         return mock_gateway
 
@@ -54,63 +163,90 @@ class DescribeHttpTransport:
         transport.shutdown()
         mock_http_gateway.shutdown.assert_called_once()
 
-    def should_work_as_context_manager(self, mock_http_gateway):
-        with HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway) as transport:
-            mock_http_gateway.initialize.assert_called_once()
+        # The context manager takes the same path
+        with HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway):
+            assert mock_http_gateway.initialize.call_count == 2
+            assert mock_http_gateway.shutdown.call_count == 1
 
-        mock_http_gateway.shutdown.assert_called_once()
+        assert mock_http_gateway.shutdown.call_count == 2
+
+    def should_omit_jsonrpc_field_when_strict_false(self, mock_http_gateway):
+        transport = HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway, strict_jsonrpc=False)
+        transport.initialize()
+
+        transport.send_request(_TEST_PARAMS_REQUEST)
 
-    def should_send_request_and_receive_response(self, mock_http_gateway):
-        expected_response = {"jsonrpc": "2.0", "id": 1, "result": "success"}
-        mock_http_gateway.post.return_value = expected_response
+        _, payload = mock_http_gateway.post.call_args.args
+        assert payload == _EXPECTED_TEST_PARAMS_LAX
 
+    @pytest.mark.parametrize("gateway_error, expected_message", [
+        (RuntimeError("HTTP client not initialized. Call initialize() first."), "HTTP client not initialized"),
+        (_HTTP_404_ERR, "HTTP request failed: 404 Not Found"),
+    ], ids=["not_initialized", "http_error"])
+    def should_raise_mcp_transport_error_when_gateway_fails(self, mock_http_gateway, gateway_error, expected_message):
+        mock_http_gateway.post.side_effect = gateway_error
         transport = HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway)
-        transport.initialize()
 
-        request = JsonRpcRequest(id=1, method="test", params={"key": "value"})
-        response = transport.send_request(request)
+        with pytest.raises(McpTransportError, match=expected_message):
+            transport.send_request(_TEST_REQUEST)
+
+    def should_share_one_gateway_client_across_requests(self, mock_http_gateway):
+        with HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway) as transport:
+            transport.send_request(_TEST_REQUEST)
+            transport.send_request(JsonRpcRequest(id=2, method="test"))
+
+        mock_http_gateway.initialize.assert_called_once()
+        assert mock_http_gateway.post.call_count == 2
 
-        assert response == expected_response
-        mock_http_gateway.post.assert_called_once_with(
-            "http://example.com/mcp", 
-            {"jsonrpc": "2.0", "id": 1, "method": "test", "params": {"key": "value"}}
-        )
+    def should_return_no_responses_for_batch_of_notifications(self, mock_http_gateway):
+        mock_http_gateway.post.return_value = None
+        transport = HttpTransport(url="http://localhost:8080/jsonrpc", http_gateway=mock_http_gateway)
 
-    def should_raise_mcp_transport_error_if_client_not_initialized(self, mocker):
-        mock_gateway = Mock(spec=HttpClientGateway)
-        mock_gateway.post.side_effect = RuntimeError("HTTP client not initialized. Call initialize() first.")
+        responses = transport.send_batch([JsonRpcRequest(method="notifications/initialized"), JsonRpcRequest(method="ping")])
 
-        transport = HttpTransport(url="http://example.com/mcp", http_gateway=mock_gateway)
-        request = JsonRpcRequest(id=1, method="test")
+        assert responses == [None, None]
 
-        with pytest.raises(McpTransportError, match="HTTP client not initialized"):
-            transport.send_request(request)
+    def should_send_many_requests_and_return_responses_in_order(self, mock_http_gateway):
+        def post(url, payload):
+            request = json.loads(payload)
+            return {"jsonrpc": "2.0", "id": request["id"], "result": request["method"]}
 
-    def should_raise_json_rpc_error_if_server_returns_rpc_error(self, mock_http_gateway):
-        error_response = {"jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Method not found"}}
-        mock_http_gateway.post.return_value = error_response
+        mock_http_gateway.post.side_effect = post
 
         transport = HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway)
         transport.initialize()
 
-        request = JsonRpcRequest(id=1, method="unknown")
-        with pytest.raises(McpTransportError) as exc_info:
-            transport.send_request(request)
+        requests = [JsonRpcRequest(id=i, method=f"test{i}") for i in range(1, 5)]
+        responses = transport.send_many(requests, max_workers=4)
+
+        assert [r["result"] for r in responses] == ["test1", "test2", "test3", "test4"]
+        assert mock_http_gateway.post.call_count == 4
+
+    def should_send_request_asynchronously(self, mock_http_gateway):
+        mock_http_gateway.apost = AsyncMock(return_value={"jsonrpc": "2.0", "id": 1, "result": "async_success"})
+        mock_http_gateway.ashutdown = AsyncMock()
+        transport = HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway)
+
+        async def exercise():
+            async with transport:
+                return await transport.asend_request(_TEST_REQUEST)
 
-        # Check that the error message contains the expected parts
-        error_msg = str(exc_info.value)
-        assert "Method not found" in error_msg
+        response = asyncio.run(exercise())
 
-    def should_raise_mcp_transport_error_on_http_error(self, mock_http_gateway):
-        # Configure the mock to raise an exception when post is called
-        mock_http_gateway.post.side_effect = Exception("HTTP error: 404 - Not Found")
+        assert response["result"] == "async_success"
+        url, payload = mock_http_gateway.apost.call_args.args
+        assert url == "http://example.com/mcp"
+        assert payload == _EXPECTED_TEST
+        mock_http_gateway.ashutdown.assert_awaited_once()
 
+    def should_raise_json_rpc_error_from_async_request(self, mock_http_gateway):
+        mock_http_gateway.apost = AsyncMock(return_value={
+            "jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Method not found"},
+        })
         transport = HttpTransport(url="http://example.com/mcp", http_gateway=mock_http_gateway)
-        transport.initialize()
 
-        request = JsonRpcRequest(id=1, method="test")
-        with pytest.raises(McpTransportError, match="HTTP request failed: HTTP error: 404 - Not Found"):
-            transport.send_request(request)
+        with pytest.raises(McpTransportError, match="Method not found"):
+            asyncio.run(transport.asend_request(_UNKNOWN_REQUEST))
 
 
 class DescribeStdioTransport:
@@ -118,17 +254,19 @@ class DescribeStdioTransport:
 
     @pytest.fixture
     def mock_stdio_gateway(self, mocker):
-        mock_gateway = Mock(spec=StdioGateway)
+        mock_gateway = Mock(spec=_STDIO_GATEWAY_SPEC)
         mock_gateway.start_process.return_value = 12345  # PID
         mock_gateway.is_process_running.return_value = True
-        mock_gateway.read_line.return_value = json.dumps({"jsonrpc": "2.0", "id": 1, "result": "stdio_success"})
+        mock_gateway.read_response.return_value = {"jsonrpc": "2.0", "id": 1, "result": "stdio_success"}
         return mock_gateway
 
     def should_be_instantiated(self):
         transport = StdioTransport(command=["my_server_cmd", "--arg"])
         assert isinstance(transport, StdioTransport)
         assert transport._command == ["my_server_cmd", "--arg"]
+        assert transport._timeout == 30.0
         assert isinstance(transport._stdio_gateway, StdioGateway)
+        assert transport._stdio_gateway._timeout == 30.0
         assert transport._pid is None
 
     def should_initialize_and_shutdown_subprocess_correctly(self, mock_stdio_gateway):
@@ -140,110 +278,372 @@ class DescribeStdioTransport:
 
         # Shutdown sequence
         mock_stdio_gateway.is_process_running.assert_called()
-        mock_stdio_gateway.write_line.assert_called_with(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "exit", "params": {}}))
+        mock_stdio_gateway.write_line.assert_called_with(_EXIT_MSG)
         mock_stdio_gateway.terminate_process.assert_called_once()
         assert transport._pid is None
 
-
-    def should_send_request_and_receive_response_via_stdio(self, mock_stdio_gateway):
-        expected_response_json = {"jsonrpc": "2.0", "id": 1, "result": "stdio_success"}
-        mock_stdio_gateway.read_line.return_value = json.dumps(expected_response_json)
+    def should_reuse_serialized_template_for_parameterless_requests(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.side_effect = [
+            {"jsonrpc": "2.0", "id": 7, "result": {}},
+            {"jsonrpc": "2.0", "id": 8, "result": {}},
+        ]
 
         transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
         with transport:
-            # Reset the mock to clear any previous calls
-            mock_stdio_gateway.write_line.reset_mock()
+            transport.send_request(JsonRpcRequest(id=7, method="ping", params={}))
+            transport.send_request(JsonRpcRequest(id=8, method="ping", params={}))
+
+            written = [c.args[0] for c in mock_stdio_gateway.write_line.call_args_list]
+            assert written == [_EXPECTED_PING7, _EXPECTED_PING8]
+            assert list(transport._request_suffixes) == [("ping", False)]
 
-            request = JsonRpcRequest(id=1, method="test_stdio", params={"key": "val"})
-            response = transport.send_request(request)
+    def should_assign_ids_to_batch_requests_without_one(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.return_value = [
+            {"jsonrpc": "2.0", "id": i, "result": f"result{i}"} for i in (2, 1, 4, 3)
+        ]
 
-            assert response == expected_response_json
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+        with transport:
+            requests = [JsonRpcRequest(method=f"test{i}") for i in range(1, 5)]
+            responses = transport.send_batch(requests)
 
-            # Check that the write_line method was called with the expected payload
-            expected_payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "test_stdio", "params": {"key": "val"}})
-            mock_stdio_gateway.write_line.assert_called_with(expected_payload)
+            assert [r["result"] for r in responses] == ["result1", "result2", "result3", "result4"]
+            mock_stdio_gateway.write_line.assert_called_once()
+            assert mock_stdio_gateway.write_line.call_args.args == (_EXPECTED_BATCH,)
 
     def should_raise_mcp_transport_error_if_stdio_command_not_found(self, mocker):
-        mock_gateway = Mock(spec=StdioGateway)
+        mock_gateway = Mock(spec=_STDIO_GATEWAY_SPEC)
         mock_gateway.start_process.side_effect = FileNotFoundError("Command 'nonexistent' not found")
 
         transport = StdioTransport(command=["nonexistent"], stdio_gateway=mock_gateway)
         with pytest.raises(McpTransportError, match="Command not found: nonexistent"):
             transport.initialize() # or with transport:
 
-    def should_raise_mcp_transport_error_on_broken_pipe_during_send(self, mock_stdio_gateway):
-        # Configure the mock to raise BrokenPipeError when write_line is called
-        mock_stdio_gateway.write_line.side_effect = BrokenPipeError("Broken pipe")
+    @pytest.mark.parametrize("write_error, read_error, started, expected_message", [
+        (BrokenPipeError("Broken pipe"), None, True,
+         r"Broken pipe with STDIO process \(PID: 12345\)\. Stderr: Some error output"),
+        (None, json.JSONDecodeError("Expecting value", "not json", 0), True, "Invalid JSON response from STDIO server"),
+        (None, TimeoutError("No output from process within 5.0 seconds."), True, "STDIO read timeout"),
+        (None, None, False, "STDIO process not running or process terminated."),
+    ], ids=["broken_pipe", "invalid_json", "read_timeout", "not_running"])
+    def should_raise_mcp_transport_error_when_exchange_fails(self, mock_stdio_gateway, write_error, read_error, started,
+                                                             expected_message):
+        mock_stdio_gateway.write_line.side_effect = write_error
+        mock_stdio_gateway.read_response.side_effect = read_error
         mock_stdio_gateway.get_stderr_output.return_value = "Some error output"
+        transport = StdioTransport(command=["my_server"], timeout=5.0, stdio_gateway=mock_stdio_gateway)
+        if started:
+            transport.initialize()
+
+        with pytest.raises(McpTransportError, match=expected_message):
+            transport.send_request(_TEST_REQUEST)
+
+    def should_assign_and_use_request_id_if_not_provided(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.side_effect = [
+            {"jsonrpc": "2.0", "id": 1, "result": "success_auto_id"},
+            {"jsonrpc": "2.0", "id": 2, "result": "success_auto_id"}
+        ]
 
         transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
         with transport:
-            request = JsonRpcRequest(id=1, method="test")
-            with pytest.raises(McpTransportError) as exc_info:
-                transport.send_request(request)
+            response1 = transport.send_request(JsonRpcRequest(method="test1"))
+            response2 = transport.send_request(JsonRpcRequest(method="test2"))
+
+            # StdioTransport assigns IDs 1 and 2 in turn
+            assert (response1["id"], response2["id"]) == (1, 2)
+            assert mock_stdio_gateway.write_line.call_args_list == _EXPECTED_AUTO_ID_WRITES
 
-            # Check that the error message contains the expected parts
-            error_msg = str(exc_info.value)
-            assert "Broken pipe with STDIO process" in error_msg
-            assert "Some error output" in error_msg
+    def should_not_poll_process_on_each_send(self, mock_stdio_gateway):
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+        with transport:
+            transport.send_request(_TEST_REQUEST)
+            transport.send_request(_TEST_REQUEST)
 
-    def should_raise_json_rpc_error_if_stdio_server_returns_rpc_error(self, mock_stdio_gateway):
-        error_payload = {"code": -32601, "message": "Method Not Found via STDIO"}
+            mock_stdio_gateway.is_process_running.assert_not_called()
 
-        # Configure the mock to return an error response
-        mock_stdio_gateway.read_line.return_value = json.dumps({"jsonrpc": "2.0", "id": 1, "error": error_payload})
+    def should_stop_sending_after_process_closes_stdout(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.side_effect = EOFError("No more output from process.")
+        mock_stdio_gateway.get_stderr_output.return_value = ""
 
         transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
         with transport:
-            request = JsonRpcRequest(id=1, method="unknown")
+            with pytest.raises(McpTransportError, match="No response from STDIO process"):
+                transport.send_request(_TEST_REQUEST)
+            mock_stdio_gateway.write_line = Mock()
+
+            with pytest.raises(McpTransportError, match="STDIO process not running or process terminated."):
+                transport.send_request(JsonRpcRequest(id=2, method="test"))
+            mock_stdio_gateway.write_line.assert_not_called()
+
+    def should_not_hand_a_timed_out_reply_to_the_next_request(self, mock_stdio_gateway):
+        first_written = threading.Event()
+        second_written = threading.Event()
+        written_ids = []
+
+        def write_line(line):
+            written_ids.append(json.loads(line)["id"])
+            if len(written_ids) == 1:
+                first_written.set()
+            elif len(written_ids) == 2:
+                second_written.set()
+
+        def read_response():
+            # The first request times out only once the second is already waiting to read
+            assert second_written.wait(timeout=5)
+            raise TimeoutError("No output from process within 1.0 seconds.")
+
+        mock_stdio_gateway.write_line.side_effect = write_line
+        mock_stdio_gateway.read_response.side_effect = read_response
+
+        transport = StdioTransport(command=["my_server"], timeout=1.0, stdio_gateway=mock_stdio_gateway)
+        with transport:
+            errors = {}
 
-            # The implementation wraps JsonRpcError in McpTransportError
-            with pytest.raises(McpTransportError) as exc_info:
-                transport.send_request(request)
+            def send(name, request_id):
+                try:
+                    transport.send_request(JsonRpcRequest(id=request_id, method=name))
+                except McpTransportError as e:
+                    errors[name] = str(e)
 
-            # Check that the error message contains the expected parts
-            error_msg = str(exc_info.value)
-            assert "Method Not Found via STDIO" in error_msg
+            first = threading.Thread(target=send, args=("a", 1))
+            first.start()
+            assert first_written.wait(timeout=5)
+            second = threading.Thread(target=send, args=("b", 2))
+            second.start()
+            first.join(timeout=5)
+            second.join(timeout=5)
 
-    def should_assign_and_use_request_id_if_not_provided(self, mock_stdio_gateway):
-        # Configure the mock to return different responses for different calls
-        responses = [
-            json.dumps({"jsonrpc": "2.0", "id": 1, "result": "success_auto_id"}),
-            json.dumps({"jsonrpc": "2.0", "id": 2, "result": "success_auto_id"})
+        assert "STDIO read timeout" in errors["a"]
+        assert errors["b"] == "STDIO process not running or process terminated."
+        mock_stdio_gateway.read_response.assert_called_once()
+
+    def should_raise_and_stop_on_response_with_mismatched_id(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.return_value = {"jsonrpc": "2.0", "id": 1, "result": "late"}
+
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+        with transport:
+            with pytest.raises(McpTransportError, match="STDIO response ID 1 does not match request ID 2"):
+                transport.send_request(JsonRpcRequest(id=2, method="test"))
+
+            assert not transport._alive
+
+    def should_pass_server_messages_to_handler_while_awaiting_response(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.side_effect = [
+            _LOG_NOTIFICATION,
+            _ROOTS_REQUEST,
+            {"jsonrpc": "2.0", "id": 1, "result": "done"},
+        ]
+        notifications = []
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway,
+                                   on_notification=notifications.append)
+
+        with transport:
+            response = transport.send_request(_TEST_REQUEST)
+
+            assert transport._alive
+
+        assert response["result"] == "done"
+        assert notifications == [_LOG_NOTIFICATION, _ROOTS_REQUEST]
+
+    def should_skip_server_messages_while_awaiting_batch_response(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.side_effect = [
+            _LOG_NOTIFICATION,
+            [{"jsonrpc": "2.0", "id": 2, "result": "b"}, {"jsonrpc": "2.0", "id": 1, "result": "a"}],
+        ]
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+
+        with transport:
+            responses = transport.send_batch([JsonRpcRequest(id=1, method="a"), JsonRpcRequest(id=2, method="b")])
+
+        assert [response["result"] for response in responses] == ["a", "b"]
+
+    def should_stop_after_reply_that_does_not_answer_the_batch(self, mock_stdio_gateway):
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+
+        with transport:
+            with pytest.raises(McpTransportError, match="Expected a JSON-RPC batch response"):
+                transport.send_batch([JsonRpcRequest(id=1, method="a"), JsonRpcRequest(id=2, method="b")])
+            with pytest.raises(McpTransportError, match="STDIO process not running"):
+                transport.send_request(JsonRpcRequest(id=3, method="test"))
+
+    def should_stop_after_batch_reply_to_single_request(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.return_value = [{"jsonrpc": "2.0", "id": 1, "result": "a"}]
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+
+        with transport:
+            with pytest.raises(McpTransportError, match="Expected a JSON-RPC response but received: list"):
+                transport.send_request(_TEST_REQUEST)
+
+            assert not transport._alive
+
+    def should_raise_json_rpc_error_carried_with_null_id(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_response.return_value = {
+            "jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"},
+        }
+
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+        with transport:
+            with pytest.raises(McpTransportError, match="Parse error"):
+                transport.send_request(_TEST_REQUEST)
+
+    def should_accept_next_write_while_previous_response_is_pending(self, mock_stdio_gateway):
+        first_written = threading.Event()
+        second_written = threading.Event()
+        written_ids = []
+
+        def write_line(line):
+            written_ids.append(json.loads(line)["id"])
+            if len(written_ids) == 1:
+                first_written.set()
+            elif len(written_ids) == 2:
+                second_written.set()
+
+        responses = iter([
+            {"jsonrpc": "2.0", "id": 1, "result": "first"},
+            {"jsonrpc": "2.0", "id": 2, "result": "second"},
+        ])
+
+        def read_response():
+            # The first response is held back until the second request has been written
+            assert second_written.wait(timeout=5)
+            return next(responses)
+
+        mock_stdio_gateway.write_line.side_effect = write_line
+        mock_stdio_gateway.read_response.side_effect = read_response
+
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+        with transport:
+            results = {}
+            first = threading.Thread(
+                target=lambda: results.update(first=transport.send_request(JsonRpcRequest(id=1, method="a"))))
+            first.start()
+            assert first_written.wait(timeout=5)
+            second = threading.Thread(
+                target=lambda: results.update(second=transport.send_request(JsonRpcRequest(id=2, method="b"))))
+            second.start()
+            first.join(timeout=5)
+            second.join(timeout=5)
+
+        assert results["first"]["result"] == "first"
+        assert results["second"]["result"] == "second"
+
+    def should_pipeline_concurrent_async_requests_through_one_reader(self, mocker, mock_stdio_gateway):
+        written_ids = []
+        mock_stdio_gateway.write_line.side_effect = lambda line: written_ids.append(json.loads(line)["id"])
+        # Answer the most recently written request first to show responses are matched by ID
+        mock_stdio_gateway.read_line.side_effect = lambda: _RESPONSE_LINES[written_ids.pop()]
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+        reader = mocker.spy(transport, "_read_pending_responses")
+
+        async def exercise():
+            return await asyncio.gather(*(transport.asend_request(JsonRpcRequest(method="test")) for _ in range(10)))
+
+        with transport:
+            responses = asyncio.run(exercise())
+
+        assert [response["result"] for response in responses] == [f"result{i}" for i in range(1, 11)]
+        assert mock_stdio_gateway.read_line.call_count == 10
+        reader.assert_called_once()
+
+    def should_stop_waiting_for_cancelled_async_request(self, mock_stdio_gateway):
+        reply_due = threading.Event()
+
+        def read_line():
+            assert reply_due.wait(timeout=5)
+            return _RESPONSE_LINES[1]
+
+        mock_stdio_gateway.read_line.side_effect = read_line
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+
+        async def exercise():
+            request = asyncio.create_task(transport.asend_request(JsonRpcRequest(id=1, method="test")))
+            await asyncio.sleep(0)
+            request.cancel()
+            await asyncio.sleep(0)
+            pending_after_cancel = dict(transport._pending)
+            reply_due.set()
+            await transport._reader_task
+            return pending_after_cancel
+
+        with transport:
+            pending_after_cancel = asyncio.run(exercise())
+
+        assert pending_after_cancel == {}
+
+    def should_raise_json_rpc_error_only_for_the_failing_async_request(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_line.side_effect = [
+            b'{"jsonrpc":"2.0","id":1,"error":{"code":-32601,"message":"Method not found"}}',
+            b'{"jsonrpc":"2.0","id":2,"result":"ok"}',
         ]
-        mock_stdio_gateway.read_line.side_effect = responses
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
 
+        async def exercise():
+            return await asyncio.gather(
+                transport.asend_request(_UNKNOWN_REQUEST),
+                transport.asend_request(JsonRpcRequest(id=2, method="test")),
+                return_exceptions=True,
+            )
+
+        with transport:
+            failed, succeeded = asyncio.run(exercise())
+
+        assert isinstance(failed, JsonRpcError)
+        assert succeeded["result"] == "ok"
+
+    def should_fail_all_pending_async_requests_when_process_closes_stdout(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_line.side_effect = EOFError("No more output from process.")
+        mock_stdio_gateway.get_stderr_output.return_value = ""
         transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
+
+        async def exercise():
+            return await asyncio.gather(
+                transport.asend_request(JsonRpcRequest(id=1, method="a")),
+                transport.asend_request(JsonRpcRequest(id=2, method="b")),
+                return_exceptions=True,
+            )
+
         with transport:
-            # Reset the mock to clear any previous calls
-            mock_stdio_gateway.write_line.reset_mock()
+            results = asyncio.run(exercise())
 
-            # First request, no ID
-            request1 = JsonRpcRequest(method="test1")
-            response1 = transport.send_request(request1)
-            assert response1["id"] == 1 # StdioTransport assigns 1
+            assert all(isinstance(result, McpTransportError) for result in results)
+            assert not transport._alive
 
-            # Check that the write_line method was called with the expected payload
-            mock_stdio_gateway.write_line.assert_called_with(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "test1"}))
+    def should_not_decode_notifications_while_awaiting_async_responses(self, mocker, mock_stdio_gateway):
+        mock_stdio_gateway.read_line.side_effect = [
+            b'{"jsonrpc":"2.0","method":"notifications/progress","params":{"progress":50}}',
+            b'{"jsonrpc":"2.0","id":1,"result":"done"}',
+        ]
+        loads = mocker.patch("mojentic_mcp.transports._loads", new=Mock(side_effect=json.loads))
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
 
-            # Reset the mock again
-            mock_stdio_gateway.write_line.reset_mock()
+        with transport:
+            response = asyncio.run(transport.asend_request(_TEST_REQUEST))
+
+        assert response["result"] == "done"
+        loads.assert_called_once_with(b'{"jsonrpc":"2.0","id":1,"result":"done"}')
 
-            # Second request, no ID
-            request2 = JsonRpcRequest(method="test2")
-            response2 = transport.send_request(request2)
-            assert response2["id"] == 2 # StdioTransport assigns 2
+    def should_match_async_response_with_escaped_string_id(self, mock_stdio_gateway):
+        # The process closes stdout after replying, so a discarded reply fails the request instead of hanging it
+        mock_stdio_gateway.read_line.side_effect = [b'{"jsonrpc":"2.0","id":"a\\"b","result":"done"}', EOFError()]
+        mock_stdio_gateway.get_stderr_output.return_value = ""
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway)
 
-            # Check that the write_line method was called with the expected payload
-            mock_stdio_gateway.write_line.assert_called_with(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "test2"}))
+        with transport:
+            response = asyncio.run(transport.asend_request(JsonRpcRequest(id='a"b', method="test")))
 
-    def should_raise_error_if_process_not_running_on_send(self, mock_stdio_gateway):
-        # Configure the mock to report that the process is not running
-        mock_stdio_gateway.is_process_running.return_value = False
+        assert response["result"] == "done"
 
-        transport = StdioTransport(command=["test"], stdio_gateway=mock_stdio_gateway)
-        transport._pid = 12345  # Simulate that initialize was called
+    def should_pass_notifications_to_handler_while_awaiting_async_responses(self, mock_stdio_gateway):
+        mock_stdio_gateway.read_line.side_effect = [
+            b'{"jsonrpc":"2.0","method":"notifications/progress","params":{"id":1,"progress":50}}',
+            b'{"jsonrpc":"2.0","id":1,"result":"done"}',
+        ]
+        notifications = []
+        transport = StdioTransport(command=["my_server"], stdio_gateway=mock_stdio_gateway,
+                                   on_notification=notifications.append)
+
+        with transport:
+            response = asyncio.run(transport.asend_request(_TEST_REQUEST))
 
-        request = JsonRpcRequest(id=1, method="test")
-        with pytest.raises(McpTransportError, match="STDIO process not running or process terminated."):
-            transport.send_request(request)
+        assert response["result"] == "done"
+        assert notifications == [{"jsonrpc": "2.0", "method": "notifications/progress", "params": {"id": 1, "progress": 50}}]